@@ -1,36 +1,144 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import os
 import re
-import traceback
-from datetime import datetime, timezone, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
+from discord.http import handle_message_parameters
 
 from ..db import get_pool
 import bot.db as db
-from ..ui.dm_styles import send_pretty_interest_dm
+from ..ui.dm_styles import embed_timestamp, send_pretty_interest_dm
 from ..database import moderation_db, cooldowns_db
+from ..utils.ratelimit import TokenBucket
 
 LOGGER = logging.getLogger("lfg_ads")
-if not LOGGER.handlers:
-    h = logging.StreamHandler()
-    fmt = logging.Formatter("[%(asctime)s] %(levelname)s lfg_ads: %(message)s")
-    h.setFormatter(fmt)
-    LOGGER.addHandler(h)
-LOGGER.setLevel(logging.INFO)
 
 POST_TIMEOUT_SECONDS = int(os.getenv("LFG_POST_TIMEOUT_SECONDS", "60"))
 USER_COOLDOWN_SEC = 5 * 60
 MAX_SEND_CONCURRENCY = int(os.getenv("LFG_POST_MAX_CONCURRENCY", "5"))
 PER_SEND_TIMEOUT = int(os.getenv("LFG_POST_PER_SEND_TIMEOUT", "8"))
+# Discord's global limit is ~50 req/s per bot; pace broadcasts just under it.
+SEND_RATE_PER_SEC = float(os.getenv("LFG_POST_SEND_RATE_PER_SEC", "45"))
+STATS_FLUSH_SECONDS = float(os.getenv("LFG_STATS_FLUSH_SECONDS", "5"))
+PRE_ACK_DB_TIMEOUT = 2.5  # DB work before the first response must leave room inside Discord's 3s window
+PRE_ACK_MIN_BUDGET = 0.25  # below this, answer first rather than start a pre-ack query
 SURFACE_ERROR_CODE = os.getenv("LFG_SURFACE_ERROR_CODE", "1") == "1"
 
-AD_ID_RE = re.compile(r"Ad\s*#\s*(\d+)", re.IGNORECASE)
+# Hot statements as constants: asyncpg's per-connection statement cache is keyed on
+# the exact text. _Q_AD_BY_ID is shared by connect and report.
+_Q_AD_BY_ID = "SELECT author_id, game, platform, region, notes FROM lfg_ads WHERE id = $1"
+_Q_INSERT_AD = (
+    "INSERT INTO lfg_ads (author_id, author_name, game, platform, region, notes, status) "
+    "VALUES ($1, $2, $3, $4, $5, $6, 'open') RETURNING id"
+)
+
+AD_ID_RE = re.compile(r"Ad\s*#\s*(\d+)", re.IGNORECASE | re.ASCII)
+
+# bot.lfg_channels ({ guild_id: lfg_channel_id }) is shared with GuildSettings, which
+# also fills it a key at a time; only a full guild_settings read here stamps it loaded.
+LFG_CHANNELS_TTL = 30.0
+_lfg_channels_loaded_at: float | None = None
+_lfg_channels_refresh: asyncio.Task | None = None
+
+async def _load_lfg_channels(bot: commands.Bot, conn) -> dict[int, int]:
+    global _lfg_channels_loaded_at
+    rows = await conn.fetch(
+        "SELECT guild_id, lfg_channel_id FROM guild_settings WHERE lfg_channel_id IS NOT NULL"
+    )
+    mapping = {int(r["guild_id"]): int(r["lfg_channel_id"]) for r in rows}
+    bot.lfg_channels = mapping
+    _lfg_channels_loaded_at = time.monotonic()
+    return mapping
+
+async def _refresh_lfg_channels(bot: commands.Bot) -> None:
+    try:
+        await _load_lfg_channels(bot, get_pool())
+    except Exception:
+        LOGGER.exception("Background refresh of LFG channels failed; serving stale mapping")
+
+async def _lfg_channels(bot: commands.Bot, conn) -> dict[int, int]:
+    """Return bot.lfg_channels, reading guild_settings through `conn` (pool or connection)
+    until one full load has succeeded. After LFG_CHANNELS_TTL the current map is still
+    returned while a background task reloads it, so posts never wait on the query.
+    """
+    global _lfg_channels_refresh
+    if _lfg_channels_loaded_at is None:
+        return await _load_lfg_channels(bot, conn)
+    if time.monotonic() - _lfg_channels_loaded_at >= LFG_CHANNELS_TTL and (
+        _lfg_channels_refresh is None or _lfg_channels_refresh.done()
+    ):
+        _lfg_channels_refresh = asyncio.create_task(_refresh_lfg_channels(bot))
+    return bot.lfg_channels
+
+# Process-wide cap on in-flight broadcast sends (shared by concurrent posts).
+# A Condition-guarded counter rather than a Semaphore so the cap can be resized live.
+_ADMISSION_COND = asyncio.Condition()
+_admission_active = 0
+_admission_max = MAX_SEND_CONCURRENCY
+
+async def _acquire_slot() -> None:
+    global _admission_active
+    async with _ADMISSION_COND:
+        await _ADMISSION_COND.wait_for(lambda: _admission_active < _admission_max)
+        _admission_active += 1
+
+async def _release_slot() -> None:
+    global _admission_active
+    async with _ADMISSION_COND:
+        _admission_active -= 1
+        _ADMISSION_COND.notify(1)
+
+async def set_broadcast_concurrency(n: int) -> None:
+    """Resize the broadcast send cap; waiters re-check immediately."""
+    global _admission_max
+    async with _ADMISSION_COND:
+        _admission_max = max(1, int(n))
+        _ADMISSION_COND.notify_all()
+
+# Process-wide pacing for broadcast sends, on top of the concurrency cap above.
+_SEND_BUCKET = TokenBucket(SEND_RATE_PER_SEC, 1.0)
+
+# Per-channel pacing matching Discord's message route limit (5 per 5s per channel),
+# so back-to-back posts queue locally instead of draining the bucket into 429s.
+# One entry per configured LFG channel, so this stays as small as guild_settings.
+_CHANNEL_BUCKETS: dict[int, TokenBucket] = {}
+
+def _channel_bucket(channel_id: int) -> TokenBucket:
+    bucket = _CHANNEL_BUCKETS.get(channel_id)
+    if bucket is None:
+        bucket = _CHANNEL_BUCKETS[channel_id] = TokenBucket(5, 5.0)
+    return bucket
+
+# Owners discord.py doesn't have cached (no shared guild), kept after fetch_user so
+# repeat clicks on their ads skip the REST call; bounded LRU with a short TTL.
+_USER_CACHE: OrderedDict[int, tuple[float, discord.User]] = OrderedDict()
+_USER_CACHE_MAX = 1024
+_USER_CACHE_TTL = 300.0  # refetch after 5 min so renamed/re-avatared owners show up
+
+async def _resolve_user(client: discord.Client, user_id: int) -> discord.User:
+    user = client.get_user(user_id)  # gateway-backed, always current
+    if user is not None:
+        return user
+    now = time.monotonic()
+    hit = _USER_CACHE.get(user_id)
+    if hit is not None and hit[0] > now:
+        _USER_CACHE.move_to_end(user_id)
+        return hit[1]
+    user = await client.fetch_user(user_id)
+    _USER_CACHE[user_id] = (now + _USER_CACHE_TTL, user)
+    _USER_CACHE.move_to_end(user_id)
+    if len(_USER_CACHE) > _USER_CACHE_MAX:
+        _USER_CACHE.popitem(last=False)
+    return user
 
 async def safe_ack(
     interaction: discord.Interaction,
@@ -39,26 +147,29 @@ async def safe_ack(
     ephemeral: bool = True,
     use_thinking: bool = True,
 ) -> bool:
-    try:
-        if interaction.response.is_done():
-            if message:
-                try:
-                    await interaction.followup.send(message, ephemeral=ephemeral)
-                except (discord.NotFound, discord.HTTPException):
-                    return False
-            return True
-        else:
+    response = interaction.response
+    if not response.is_done():  # common case: first answer to this interaction
+        try:
             if message:
-                await interaction.response.send_message(message, ephemeral=True)
+                await response.send_message(message, ephemeral=True)
             else:
-                await interaction.response.defer(ephemeral=ephemeral, thinking=use_thinking)
+                await response.defer(ephemeral=ephemeral, thinking=use_thinking)
             return True
-    except discord.InteractionResponded:
-        return True
-    except discord.NotFound:
-        return False
-    except discord.HTTPException:
-        return False
+        except discord.InteractionResponded:
+            pass  # answered concurrently; fall through to a followup
+        except (discord.NotFound, discord.HTTPException):
+            return False
+    if message:
+        try:
+            await interaction.followup.send(message, ephemeral=ephemeral)
+        except (discord.NotFound, discord.HTTPException):
+            return False
+    return True
+
+def _pre_ack_budget(interaction: discord.Interaction) -> float:
+    """Seconds of PRE_ACK_DB_TIMEOUT left after gateway delivery, measured from the interaction's snowflake."""
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    return min(PRE_ACK_DB_TIMEOUT, PRE_ACK_DB_TIMEOUT - elapsed)
 
 def _err_code(prefix: str, exc: BaseException | None = None) -> str:
     if not SURFACE_ERROR_CODE:
@@ -66,20 +177,40 @@ def _err_code(prefix: str, exc: BaseException | None = None) -> str:
     typ = type(exc).__name__ if exc else ""
     return f" ({prefix}:{typ})" if typ else f" ({prefix})"
 
-def _check_channel_perms(guild: discord.Guild, channel: discord.abc.GuildChannel) -> list[str]:
+_REQUIRED_PERMS = discord.Permissions(view_channel=True, send_messages=True, embed_links=True)
+
+def _missing_perms_mask(guild: discord.Guild, channel: discord.abc.GuildChannel) -> int:
+    """Bits of _REQUIRED_PERMS the bot lacks in `channel`; 0 means it can post there."""
     me = guild.me
     if me is None:
-        return ["bot member not resolved"]
-    p = channel.permissions_for(me)
-    missing = []
-    if not p.view_channel:
-        missing.append("view_channel")
-    if not p.send_messages:
-        missing.append("send_messages")
-    if not p.embed_links:
-        missing.append("embed_links")
+        return _REQUIRED_PERMS.value
+    return _REQUIRED_PERMS.value & ~channel.permissions_for(me).value
+
+# (guild_id, channel_id) -> (expires_at, missing mask). Cleared per guild by the cog's
+# role/channel/member listeners; the TTL only backstops events we can't see.
+_PERM_CACHE: dict[tuple[int, int], tuple[float, int]] = {}
+_PERM_CACHE_TTL = 600.0
+
+def _cached_missing_perms(guild: discord.Guild, channel: discord.abc.GuildChannel) -> int:
+    if guild.me is None:  # not resolved yet; don't pin that answer
+        return _REQUIRED_PERMS.value
+    key = (guild.id, channel.id)
+    now = time.monotonic()
+    hit = _PERM_CACHE.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    missing = _missing_perms_mask(guild, channel)
+    _PERM_CACHE[key] = (now + _PERM_CACHE_TTL, missing)
     return missing
 
+def _forget_guild_perms(guild_id: int) -> None:
+    for key in [k for k in _PERM_CACHE if k[0] == guild_id]:
+        del _PERM_CACHE[key]
+
+def _perm_names(mask: int) -> list[str]:
+    """Decode a permission mask for logging (rare path)."""
+    return [name for name, has in discord.Permissions(mask) if has]
+
 def _rel(ts: datetime | None) -> str:
     if not ts:
         return ""
@@ -88,274 +219,450 @@ def _rel(ts: datetime | None) -> str:
     except Exception:
         return ts.isoformat()
 
+def _footer_ad_id(text: str) -> int | None:
+    """Fast path for the footer we emit ("... • Ad #123"); None if it isn't there."""
+    i = text.find("Ad #")
+    if i < 0:
+        return None
+    j = k = i + 4
+    n = len(text)
+    while k < n and text[k].isdigit():
+        k += 1
+    return int(text[j:k]) if k > j else None
+
+@functools.lru_cache(maxsize=4096)
+def _find_ad_id(text: str) -> int | None:
+    """AD_ID_RE over `text`, memoized: clicks on a hot ad rescan identical embed text."""
+    m = AD_ID_RE.search(text)
+    return int(m.group(1)) if m else None
+
 def _extract_ad_id_from_message(msg: discord.Message | None) -> int | None:
     if not msg:
         return None
     try:
         for emb in msg.embeds or ():
-            if emb.footer and emb.footer.text:
-                m = AD_ID_RE.search(emb.footer.text)
-                if m:
-                    return int(m.group(1))
-            if emb.title:
-                m = AD_ID_RE.search(emb.title)
-                if m:
-                    return int(m.group(1))
-            if emb.description:
-                m = AD_ID_RE.search(emb.description)
-                if m:
-                    return int(m.group(1))
+            footer = emb.footer.text if emb.footer else None
+            if footer:
+                ad_id = _footer_ad_id(footer)
+                if ad_id is not None:
+                    return ad_id
+            # One scan over footer/title/description (in that priority) instead of three.
+            ad_id = _find_ad_id("\n".join(filter(None, (footer, emb.title, emb.description))))
+            if ad_id is not None:
+                return ad_id
     except Exception:
         pass
     return None
 
+_PROFILE_URL_PREFIX = "https://discord.com/users/"
+
+def _extract_author_id_from_message(msg: discord.Message | None) -> int | None:
+    """Poster id from the embed author link set by /lfg_ad post (None for older ads)."""
+    if not msg:
+        return None
+    for emb in msg.embeds or ():
+        url = emb.author.url if emb.author else None
+        if url and url.startswith(_PROFILE_URL_PREFIX):
+            tail = url[len(_PROFILE_URL_PREFIX):]
+            if tail.isdecimal():
+                return int(tail)
+    return None
+
 # --- tiny helper for 24h expiry ----------------------------------------------
-def _is_msg_expired(msg: discord.Message | None, *, hours: int = 24) -> bool:
-    if not msg or not msg.created_at:
+def _is_msg_expired(
+    msg: discord.Message | None, *, hours: int = 24, now: float | None = None
+) -> bool:
+    """`now` is epoch seconds; the message's age comes straight from its snowflake."""
+    if not msg:
         return False
     try:
-        return msg.created_at + timedelta(hours=hours) <= datetime.now(timezone.utc)
+        created = ((msg.id >> 22) + discord.utils.DISCORD_EPOCH) / 1000
+        return (time.time() if now is None else now) - created >= hours * 3600
     except Exception:
         return False
 # -----------------------------------------------------------------------------
 
 
-class ConnectButton(ui.View):
-    """Persistent actions for an LFG ad."""
-    def __init__(self, ad_id: int | None = None, *, timeout: float | None = None):
-        super().__init__(timeout=timeout)  # None = persistent
-        self.ad_id = ad_id
+async def _notify_poster_of_interest(
+    owner_user: discord.User,
+    *,
+    interested: discord.User | discord.Member,
+    ad,
+    ad_id: int,
+    guild: discord.Guild | None,
+    message_jump: str | None,
+) -> None:
+    """DM the poster with full ad details + the interested user (rich embed)."""
+    color_seed = sum((ad["game"] or "").encode()) % 255
+    color = discord.Color.from_rgb(255 - color_seed // 2, 120 + color_seed // 3, 80)
+
+    platform, region, notes = ad["platform"], ad["region"], ad["notes"]
+    description = (
+        "**Someone is interested in your ad!**\n\n"
+        f"**Interested:** {interested.mention}\n"
+        f"**Server:** {guild.name if guild else 'Unknown'}\n\n"
+        f"**Game:** `{ad['game']}`"
+        + (f"\n**Platform:** `{platform}`" if platform else "")
+        + (f"\n**Region:** `{region}`" if region else "")
+        + (f"\n\n**Notes:** {notes}" if notes else "")
+    )
 
-    @ui.button(label="I’m interested", style=discord.ButtonStyle.success, custom_id="lfg:connect")
-    async def connect(self, interaction: discord.Interaction, button: ui.Button):
-        acked = await safe_ack(interaction, message=None, ephemeral=True, use_thinking=False)
-        sent_followup = False
-        try:
-            # GLOBAL timeout gate first
-            try:
-                if await moderation_db.is_user_globally_timed_out(interaction.user.id):
-                    until = await moderation_db.get_global_timeout_until(interaction.user.id)
-                    if acked:
-                        await interaction.followup.send(
-                            f"You’re timed out from using the bot{f' until {_rel(until)}' if until else ''}.",
-                            ephemeral=True,
-                        )
-                    return
-            except Exception:
-                LOGGER.exception("Global timeout check failed in ConnectButton.connect; allowing")
+    embed = discord.Embed(
+        title="Your LFG ad got a hit! ✨",
+        description=description,
+        color=color,
+        timestamp=embed_timestamp(),
+    )
 
-            # Per-guild gate (kept for compatibility)
-            try:
-                if interaction.guild and await moderation_db.is_user_timed_out(interaction.guild.id, interaction.user.id):
-                    until = await moderation_db.get_timeout_until(interaction.guild.id, interaction.user.id)
-                    if acked:
-                        await interaction.followup.send(
-                            f"You’re timed out from using the bot{f' until {_rel(until)}' if until else ''}.",
-                            ephemeral=True,
-                        )
-                    return
-            except Exception:
-                LOGGER.exception("Per-guild timeout check failed in ConnectButton.connect; allowing")
-
-            # 24h expiry gate
-            if _is_msg_expired(interaction.message, hours=24):
-                if acked and not sent_followup:
-                    await interaction.followup.send(
-                        "This LFG post has expired. Try a newer one!",
-                        ephemeral=True,
-                    )
-                    sent_followup = True
-                return
+    avatar = getattr(getattr(interested, "display_avatar", None), "url", None)
+    if avatar:
+        embed.set_author(name=str(interested), icon_url=avatar)
+        embed.set_thumbnail(url=avatar)
 
-            # Resolve ad_id
-            ad_id = self.ad_id or _extract_ad_id_from_message(interaction.message)
-            if not ad_id:
-                if acked and not sent_followup:
-                    await interaction.followup.send(
-                        "This ad can’t be identified anymore. It might be too old or malformed.",
-                        ephemeral=True,
-                    )
-                return
+    embed.set_footer(
+        text=f"Ad #{ad_id} • Powered by Matchmaker",
+        icon_url="https://i.imgur.com/4x9pIr0.png",
+    )
 
-            user = interaction.user
-            pool = get_pool()
-            if pool is None:
-                raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
+    view = discord.ui.View()
+    if message_jump:
+        view.add_item(discord.ui.Button(label="Open the ad", url=message_jump, emoji="🔗"))
+    view.add_item(
+        discord.ui.Button(
+            label="Message interested user",
+            url=f"discord://-/users/{interested.id}",
+            emoji="✉️",
+        )
+    )
 
-            # Allow unlimited clicks (do not close ad)
-            async with pool.acquire() as conn:
-                ad = await conn.fetchrow(
-                    """
-                    SELECT id, author_id, author_name, game, platform, region, notes
-                    FROM lfg_ads
-                    WHERE id = $1
-                    """,
-                    int(ad_id),
-                )
-                await db.stats_inc("connections_made", 1)
+    await owner_user.send(embed=embed, view=view)
 
-            if not ad:
-                if acked:
-                    await interaction.followup.send(
-                        "This ad no longer exists.",
-                        ephemeral=True,
-                    )
-                    sent_followup = True
-                return
+async def _dm_or_log(label: str, coro) -> None:
+    """Await a DM coroutine, logging (not raising) failures so sibling DMs keep going."""
+    try:
+        await coro
+    except Exception:
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info("%s DM failed; continuing", label, exc_info=True)
 
-            owner_id = int(ad["author_id"])
-            owner_user = interaction.client.get_user(owner_id) or await interaction.client.fetch_user(owner_id)
 
-            # DM the POSTER with full ad details + interested user (rich embed)
-            if owner_user:
-                try:
-                    color_seed = (sum(ord(c) for c in (ad["game"] or "")) % 255)
-                    color = discord.Color.from_rgb(255 - color_seed // 2, 120 + color_seed // 3, 80)
-
-                    lines = [
-                        "**Someone is interested in your ad!**",
-                        "",
-                        f"**Interested:** {user.mention}",
-                        f"**Server:** {interaction.guild.name if interaction.guild else 'Unknown'}",
-                        "",
-                        f"**Game:** `{ad['game']}`",
-                    ]
-                    if ad["platform"]:
-                        lines.append(f"**Platform:** `{ad['platform']}`")
-                    if ad["region"]:
-                        lines.append(f"**Region:** `{ad['region']}`")
-                    if ad["notes"]:
-                        lines.extend(["", f"**Notes:** {ad['notes']}"])
-
-                    embed = discord.Embed(
-                        title="Your LFG ad got a hit! ✨",
-                        description="\n".join(lines),
-                        color=color,
-                        timestamp=datetime.utcnow(),
-                    )
+def _resolve_reports_open(bot: commands.Bot):
+    """Look up Reports.open_report_modal and pin it on ConnectButton (None if unavailable)."""
+    ConnectButton._reports_open = getattr(bot.get_cog("Reports"), "open_report_modal", None)
+    return ConnectButton._reports_open
 
-                    avatar = getattr(getattr(user, "display_avatar", None), "url", None)
-                    if avatar:
-                        embed.set_author(name=str(user), icon_url=avatar)
-                        embed.set_thumbnail(url=avatar)
 
-                    embed.set_footer(
-                        text=f"Ad #{ad_id} • Powered by Matchmaker",
-                        icon_url="https://i.imgur.com/4x9pIr0.png",
-                    )
+async def _handle_connect(interaction: discord.Interaction, ad_id: int | None) -> None:
+    """Handle an "I’m interested" click; `ad_id` falls back to the message footer when None."""
+    # Rejections are answered with a single response; only the slow path (ad
+    # lookup + DMs) defers first and then follows up.
+    acked = False
+    sent_followup = False
+    user = interaction.user
+    uid = user.id
+    now = interaction.created_at  # one clock for the expiry and timeout gates
+    try:
+        # 24h expiry gate
+        if _is_msg_expired(interaction.message, hours=24, now=now.timestamp()):
+            await safe_ack(interaction, message="This LFG post has expired. Try a newer one!")
+            return
 
-                    view = discord.ui.View()
-                    if interaction.message:
-                        view.add_item(discord.ui.Button(label="Open the ad", url=interaction.message.jump_url, emoji="🔗"))
-                    view.add_item(
-                        discord.ui.Button(
-                            label="Message interested user",
-                            url=f"discord://-/users/{user.id}",
-                            emoji="✉️",
-                        )
-                    )
+        # Resolve ad_id
+        ad_id = ad_id or _extract_ad_id_from_message(interaction.message)
+        if not ad_id:
+            await safe_ack(
+                interaction,
+                message="This ad can’t be identified anymore. It might be too old or malformed.",
+            )
+            return
 
-                    await owner_user.send(embed=embed, view=view)
-                except Exception:
-                    LOGGER.info("Owner DM failed; continuing", exc_info=True)
+        # Timeout gate: global and per-guild expiry in one query, bounded by what's
+        # left of the response window. If delivery already used most of it, ack first
+        # and run the check afterwards.
+        guild = interaction.guild
+        budget = _pre_ack_budget(interaction)
+        if budget < PRE_ACK_MIN_BUDGET:
+            acked = await safe_ack(interaction, message=None, ephemeral=True, use_thinking=False)
+            budget = PRE_ACK_DB_TIMEOUT
+        try:
+            global_until, guild_until = await asyncio.wait_for(
+                moderation_db.get_timeouts(uid, guild.id if guild else None, now=now),
+                timeout=budget,
+            )
+        except Exception:
+            LOGGER.exception("Timeout check failed in LFG connect; allowing")
+            global_until = guild_until = None
+        until = next((u for u in (global_until, guild_until) if u and u > now), None)
+        if until:
+            # Replies directly, or follows up if we acked early above.
+            await safe_ack(interaction, message=f"You’re timed out from using the bot until {_rel(until)}.")
+            return
 
-            # DM the CONNECTOR with mirrored details (now includes platform/region)
-            try:
-                await send_pretty_interest_dm(
-                    recipient=user,
-                    poster=owner_user,
-                    ad_id=int(ad_id),
-                    game=ad["game"],
-                    platform=ad["platform"],
-                    region=ad["region"],
-                    notes=ad["notes"],
-                    message_jump=interaction.message.jump_url if interaction.message else None,
-                    guild=interaction.guild,
-                )
-            except Exception:
-                LOGGER.info("Connector DM failed; continuing", exc_info=True)
+        if not acked:
+            acked = await safe_ack(interaction, message=None, ephemeral=True, use_thinking=False)
 
-            jump = None
-            try:
-                if interaction.message:
-                    jump = interaction.message.jump_url
-            except Exception:
-                jump = None
+        pool = get_pool()
+        if pool is None:
+            raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
+
+        # Allow unlimited clicks (do not close ad)
+        ad = await pool.fetchrow(_Q_AD_BY_ID, int(ad_id))
+        db.stats_bump("connections_made")
 
+        if not ad:
             if acked:
-                if jump:
-                    await interaction.followup.send(
-                        f"✅ I DM’d you both so you can coordinate. Have fun!\n"
-                        f"Jump back to the ad: {jump}",
-                        ephemeral=True,
-                    )
-                else:
-                    await interaction.followup.send(
-                        "✅ I DM’d you both so you can coordinate. Have fun!",
-                        ephemeral=True,
-                    )
+                await interaction.followup.send(
+                    "This ad no longer exists.",
+                    ephemeral=True,
+                )
                 sent_followup = True
+            return
 
-        except Exception as exc:
-            LOGGER.error("ConnectButton.connect failed:\n%s", traceback.format_exc())
-            if acked and not sent_followup:
-                try:
-                    await interaction.followup.send(
-                        "Something went wrong while connecting. Try again." + _err_code("CONNECT", exc),
-                        ephemeral=True,
-                    )
-                    sent_followup = True
-                except Exception:
-                    pass
+        owner_id = int(ad["author_id"])
+        owner_user = await _resolve_user(interaction.client, owner_id)
 
-    @ui.button(label="Report", style=discord.ButtonStyle.danger, custom_id="lfg:report")
-    async def report(self, interaction: discord.Interaction, button: ui.Button):
+        jump = interaction.message.jump_url if interaction.message else None
+
+        # DM the POSTER (rich embed) and the CONNECTOR (mirrored details) concurrently,
+        # bounded so a stuck DM can't hold the click past PER_SEND_TIMEOUT.
         try:
+            async with asyncio.timeout(PER_SEND_TIMEOUT):
+                async with asyncio.TaskGroup() as tg:
+                    if owner_user:
+                        tg.create_task(_dm_or_log("Owner", _notify_poster_of_interest(
+                            owner_user,
+                            interested=user,
+                            ad=ad,
+                            ad_id=int(ad_id),
+                            guild=guild,
+                            message_jump=jump,
+                        )))
+                    tg.create_task(_dm_or_log("Connector", send_pretty_interest_dm(
+                        recipient=user,
+                        poster=owner_user,
+                        ad_id=int(ad_id),
+                        game=ad["game"],
+                        platform=ad["platform"],
+                        region=ad["region"],
+                        notes=ad["notes"],
+                        message_jump=jump,
+                        guild=guild,
+                    )))
+        except* Exception:
+            if LOGGER.isEnabledFor(logging.INFO):
+                LOGGER.info("Interest DMs did not finish in time; continuing", exc_info=True)
+
+        if acked:
+            if jump:
+                await interaction.followup.send(
+                    f"✅ I DM’d you both so you can coordinate. Have fun!\n"
+                    f"Jump back to the ad: {jump}",
+                    ephemeral=True,
+                )
+            else:
+                await interaction.followup.send(
+                    "✅ I DM’d you both so you can coordinate. Have fun!",
+                    ephemeral=True,
+                )
+            sent_followup = True
+
+    except Exception as exc:
+        LOGGER.exception("LFG connect failed")
+        if not sent_followup:
+            try:
+                # Responds directly if we failed before deferring, else follows up.
+                await safe_ack(
+                    interaction,
+                    message="Something went wrong while connecting. Try again." + _err_code("CONNECT", exc),
+                )
+                sent_followup = True
+            except Exception:
+                pass
+
+
+async def _handle_report(interaction: discord.Interaction, ad_id: int | None) -> None:
+    """Handle a Report click; `ad_id` falls back to the message footer when None."""
+    try:
+        ad_id = ad_id or _extract_ad_id_from_message(interaction.message)
+        if not ad_id:
+            await interaction.response.send_message("This ad can’t be identified anymore.", ephemeral=True)
+            return
+
+        # Ads carry the poster's id in the embed author link (the modal checks on submit
+        # that the ad still exists); older ones need a lookup.
+        # A modal can't follow a defer, so that lookup must finish inside Discord's
+        # 3s window: bound it by what's left and bail out with a plain reply otherwise.
+        reported_id = _extract_author_id_from_message(interaction.message)
+        if reported_id is None:
             pool = get_pool()
             if pool is None:
                 raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
-
-            ad_id = self.ad_id or _extract_ad_id_from_message(interaction.message)
-            if not ad_id:
-                await interaction.response.send_message("This ad can’t be identified anymore.", ephemeral=True)
-                return
-
-            async with pool.acquire() as conn:
-                ad_row = await conn.fetchrow(
-                    "SELECT id, author_id FROM lfg_ads WHERE id = $1",
-                    int(ad_id),
+            try:
+                budget = _pre_ack_budget(interaction)
+                if budget < PRE_ACK_MIN_BUDGET:
+                    raise asyncio.TimeoutError
+                ad_row = await asyncio.wait_for(
+                    pool.fetchrow(_Q_AD_BY_ID, int(ad_id)),
+                    timeout=budget,
                 )
+            except asyncio.TimeoutError:
+                LOGGER.warning("Report lookup for ad #%s timed out", ad_id)
+                await interaction.response.send_message(
+                    "Reporting is busy right now. Please try again in a moment.", ephemeral=True
+                )
+                return
             if not ad_row:
                 await interaction.response.send_message("This ad no longer exists.", ephemeral=True)
                 return
-
             reported_id = int(ad_row["author_id"])
 
-            reports_cog = interaction.client.get_cog("Reports")
-            if not reports_cog or not hasattr(reports_cog, "open_report_modal"):
-                await interaction.response.send_message("Reporting isn’t available right now. Try again later.", ephemeral=True)
-                return
+        open_report_modal = ConnectButton._reports_open
+        if open_report_modal is None:
+            open_report_modal = _resolve_reports_open(interaction.client)
+        if open_report_modal is None:
+            await interaction.response.send_message("Reporting isn’t available right now. Try again later.", ephemeral=True)
+            return
 
-            await reports_cog.open_report_modal(interaction, reported_id=reported_id, ad_id=int(ad_id))
+        await open_report_modal(interaction, reported_id=reported_id, ad_id=int(ad_id))
 
-        except Exception:
-            LOGGER.exception("Failed to open report modal")
-            if interaction.response.is_done():
-                await interaction.followup.send("Something went wrong while opening the report form.", ephemeral=True)
-            else:
-                await interaction.response.send_message("Something went wrong while opening the report form.", ephemeral=True)
+    except Exception:
+        LOGGER.exception("Failed to open report modal")
+        if interaction.response.is_done():
+            await interaction.followup.send("Something went wrong while opening the report form.", ephemeral=True)
+        else:
+            await interaction.response.send_message("Something went wrong while opening the report form.", ephemeral=True)
+
+
+class ConnectButton(ui.View):
+    """Static-id actions for ads posted before the ad id moved into the custom_id."""
+
+    # Reports.open_report_modal, pinned by LfgAds once every cog is loaded.
+    _reports_open = None
+
+    def __init__(self, *, timeout: float | None = None):
+        super().__init__(timeout=timeout)  # None = persistent
+
+    @ui.button(label="I’m interested", style=discord.ButtonStyle.success, custom_id="lfg:connect")
+    async def connect(self, interaction: discord.Interaction, button: ui.Button):
+        await _handle_connect(interaction, None)
+
+    @ui.button(label="Report", style=discord.ButtonStyle.danger, custom_id="lfg:report")
+    async def report(self, interaction: discord.Interaction, button: ui.Button):
+        await _handle_report(interaction, None)
+
+
+class ConnectItem(ui.DynamicItem[ui.Button], template=r"lfg:connect:(?P<ad_id>\d+)"):
+    """"I’m interested" button carrying its ad id in the custom_id."""
+
+    def __init__(self, ad_id: int):
+        super().__init__(ui.Button(
+            label="I’m interested",
+            style=discord.ButtonStyle.success,
+            custom_id=f"lfg:connect:{ad_id}",
+        ))
+        self.ad_id = ad_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match: re.Match[str]):
+        return cls(int(match["ad_id"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await _handle_connect(interaction, self.ad_id)
+
+
+class ReportItem(ui.DynamicItem[ui.Button], template=r"lfg:report:(?P<ad_id>\d+)"):
+    """Report button carrying its ad id in the custom_id."""
+
+    def __init__(self, ad_id: int):
+        super().__init__(ui.Button(
+            label="Report",
+            style=discord.ButtonStyle.danger,
+            custom_id=f"lfg:report:{ad_id}",
+        ))
+        self.ad_id = ad_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match: re.Match[str]):
+        return cls(int(match["ad_id"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await _handle_report(interaction, self.ad_id)
 
 
 class LfgAds(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._stats_task: asyncio.Task | None = None
+        # Routes clicks on ads posted with the old static custom_ids.
+        self._view = ConnectButton(timeout=None)
 
     async def cog_load(self) -> None:
-        self.bot.add_view(ConnectButton(ad_id=None, timeout=None))
+        self.bot.add_view(self._view)
+        self.bot.add_dynamic_items(ConnectItem, ReportItem)
         try:
             await cooldowns_db.ensure_cooldowns_schema()
         except Exception:
             LOGGER.exception("Failed to ensure cooldowns table")
+        try:
+            await moderation_db.load_active_timeouts()
+        except Exception:
+            LOGGER.exception("Failed to load active timeouts; connect will query per click")
+        # Warm the destinations map so the first post after a restart doesn't pay for it.
+        try:
+            await _lfg_channels(self.bot, get_pool())
+        except Exception:
+            LOGGER.exception("Failed to preload LFG channels; first post will fetch them")
+        self._stats_task = asyncio.create_task(self._flush_stats_loop())
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(ConnectItem, ReportItem)
+        if self._stats_task:
+            self._stats_task.cancel()
+        try:
+            await db.stats_flush()
+        except Exception:
+            LOGGER.exception("Final stats flush failed")
+
+    async def _flush_stats_loop(self) -> None:
+        """Apply counters bumped on hot paths (db.stats_bump) every STATS_FLUSH_SECONDS."""
+        while True:
+            await asyncio.sleep(STATS_FLUSH_SECONDS)
+            try:
+                await db.stats_flush()
+            except Exception:
+                LOGGER.exception("Flushing batched stats failed")
+
+    # Anything that can change the bot's effective permissions in a guild drops
+    # that guild's cached permission results.
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        _forget_guild_perms(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        _forget_guild_perms(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        _forget_guild_perms(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        _forget_guild_perms(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if after.id == self.bot.user.id:
+            _forget_guild_perms(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        _forget_guild_perms(guild.id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Reports loads after this cog, so pin its modal opener once everything is up.
+        _resolve_reports_open(self.bot)
 
     lfg = app_commands.Group(name="lfg_ad", description="Create and manage LFG ads")
 
@@ -386,30 +693,43 @@ class LfgAds(commands.Cog):
         if not acked:
             return
 
-        async def do_post_work() -> int:
-            """Insert the ad, broadcast it, and return the number of servers posted to."""
-            # --- DB INSERT + SETTINGS FETCH ---
+        user = interaction.user
+        uid = user.id
+        uname = format(user)
+
+        async def do_post_work() -> int | None:
+            """Insert the ad, broadcast it, and return the number of servers posted to.
+
+            Returns None (and saves nothing) when no server has an LFG channel configured.
+            """
+            # --- SETTINGS FETCH + DB INSERT ---
             pool = get_pool()
             if pool is None:
                 raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
 
-            try:
-                async with pool.acquire() as conn:
+            # One checkout for both statements (the settings read is a no-op on a warm cache).
+            async with pool.acquire() as conn:
+                try:
+                    rows = list((await _lfg_channels(self.bot, conn)).items())
+                except Exception as exc:
+                    LOGGER.exception("Guild settings query failed")
+                    raise RuntimeError("GUILD_QUERY") from exc
+                if not rows:
+                    return None
+
+                try:
                     ad_id = await conn.fetchval(
-                        """
-                        INSERT INTO lfg_ads (author_id, author_name, game, platform, region, notes, status)
-                        VALUES ($1, $2, $3, $4, $5, $6, 'open') RETURNING id
-                        """,
-                        int(interaction.user.id),
-                        str(interaction.user),
+                        _Q_INSERT_AD,
+                        uid,
+                        uname,
                         game,
                         platform,
                         region,
                         notes,
                     )
-            except Exception as exc:
-                LOGGER.error("DB insert failed:\n%s", traceback.format_exc())
-                raise RuntimeError("DB_INSERT") from exc
+                except Exception as exc:
+                    LOGGER.exception("DB insert failed")
+                    raise RuntimeError("DB_INSERT") from exc
 
             try:
                 title_bits: list[str] = [game]
@@ -424,54 +744,85 @@ class LfgAds(commands.Cog):
                     color=discord.Color.blurple(),
                 )
                 embed.set_author(
-                    name=str(interaction.user),
-                    icon_url=interaction.user.display_avatar.url,
+                    name=uname,
+                    url=f"{_PROFILE_URL_PREFIX}{uid}",
+                    icon_url=user.display_avatar.url,
                 )
-                embed.set_footer(text=f"Posted by {interaction.user} • Ad #{ad_id}")
-
-                async with pool.acquire() as conn:
-                    rows = await conn.fetch(
-                        "SELECT guild_id, lfg_channel_id FROM guild_settings WHERE lfg_channel_id IS NOT NULL"
-                    )
+                embed.set_footer(text=f"Posted by {uname} • Ad #{ad_id}")
             except Exception as exc:
-                LOGGER.error("Building embed or guild settings query failed:\n%s", traceback.format_exc())
-                raise RuntimeError("GUILD_QUERY") from exc
+                LOGGER.exception("Building embed failed")
+                raise RuntimeError("EMBED_BUILD") from exc
 
             # --- BROADCAST (CONCURRENT WITH CAP) ---
-            view = ConnectButton(ad_id=ad_id)
-            sem = asyncio.Semaphore(MAX_SEND_CONCURRENCY)
-            posted_count = 0
-
-            async def send_one(guild_id: int, channel_id: int) -> bool:
+            # Serialize embed + components once; every target reuses the same payload.
+            # The ad id travels in the button custom_ids; the registered dynamic items route clicks.
+            view = ui.View(timeout=None)
+            view.add_item(ConnectItem(ad_id))
+            view.add_item(ReportItem(ad_id))
+            params = handle_message_parameters(
+                embed=embed,
+                view=view,
+                previous_allowed_mentions=self.bot.allowed_mentions,
+            )
+
+            # Resolve + validate every destination up front so tasks only exist for real sends.
+            targets: list[discord.TextChannel] = []
+            for guild_id, channel_id in rows:
                 guild = self.bot.get_guild(guild_id)
-                if not guild:
-                    return False
-                channel = guild.get_channel(channel_id)
+                channel = guild.get_channel(channel_id) if guild else None
                 if not isinstance(channel, discord.TextChannel):
+                    continue
+                missing = _cached_missing_perms(guild, channel)
+                if missing:
+                    if LOGGER.isEnabledFor(logging.INFO):
+                        LOGGER.info(
+                            "Skip %s#%s (missing perms: %s)",
+                            guild.name, channel_id, ", ".join(_perm_names(missing)),
+                        )
+                    continue
+                targets.append(channel)
+
+            async def send_one(channel: discord.TextChannel) -> bool:
+                # Wait on both rate buckets before taking a shared slot, so the slot only
+                # spans the HTTP call and pacing never holds capacity other posts could use.
+                await _channel_bucket(channel.id).acquire()
+                await _SEND_BUCKET.acquire()
+                await _acquire_slot()
+                try:
+                    # Inline deadline (no wrapper Task); POST_TIMEOUT_SECONDS still bounds the whole fan-out.
+                    async with asyncio.timeout(PER_SEND_TIMEOUT):
+                        await self.bot.http.send_message(channel.id, params=params)
+                    return True
+                except (discord.Forbidden, discord.HTTPException, TimeoutError) as exc:
+                    if LOGGER.isEnabledFor(logging.INFO):
+                        LOGGER.info("Send to %s#%s failed: %r", channel.guild.name, channel.id, exc)
                     return False
-                async with sem:
-                    try:
-                        await asyncio.wait_for(channel.send(embed=embed, view=view), timeout=PER_SEND_TIMEOUT)
-                        return True
-                    except (discord.Forbidden, discord.HTTPException, asyncio.TimeoutError) as exc:
-                        LOGGER.info("Send to %s#%s failed: %r", guild.name if guild else guild_id, channel_id, exc)
-                        return False
+                finally:
+                    await _release_slot()
 
-            tasks = [
-                asyncio.create_task(send_one(int(r["guild_id"]), int(r["lfg_channel_id"])))
-                for r in rows
-            ]
+            # Fixed pool of workers (sized to the current send cap) draining one shared
+            # iterator: only that many coroutines exist no matter how many guilds are configured.
+            pending = iter(targets)
 
-            for coro in asyncio.as_completed(tasks):
-                ok = await coro
-                if ok:
-                    posted_count += 1
+            async def worker() -> int:
+                sent = 0
+                for channel in pending:
+                    try:
+                        sent += await send_one(channel)
+                    except Exception:
+                        LOGGER.exception("Unexpected error sending to %s#%s", channel.guild.name, channel.id)
+                return sent
 
-            return posted_count
+            # TaskGroup so a POST_TIMEOUT_SECONDS cancellation tears down every in-flight send.
+            async with asyncio.TaskGroup() as tg:
+                workers = [tg.create_task(worker()) for _ in range(min(_admission_max, len(targets)))]
+            return sum(w.result() for w in workers)
 
         try:
-            posted = await asyncio.wait_for(do_post_work(), timeout=POST_TIMEOUT_SECONDS)
-        except asyncio.TimeoutError:
+            # Runs do_post_work in this task; on expiry the broadcast TaskGroup is cancelled with it.
+            async with asyncio.timeout(POST_TIMEOUT_SECONDS):
+                posted = await do_post_work()
+        except TimeoutError:
             LOGGER.warning("post() timed out after %ss", POST_TIMEOUT_SECONDS)
             try:
                 await interaction.edit_original_response(
@@ -492,13 +843,20 @@ class LfgAds(commands.Cog):
 
         # Build and send the final result (edit the original message)
         try:
-            if posted == 0:
+            if posted is None:
                 await interaction.edit_original_response(
                     content=(
-                        "Your ad was saved, but no servers have an LFG channel configured yet.\n"
+                        "No servers have an LFG channel configured yet, so your ad wasn’t posted.\n"
                         "Ask server owners to run `/lfg_channel set #channel`."
                     )
                 )
+            elif posted == 0:
+                await interaction.edit_original_response(
+                    content=(
+                        "Your ad was saved, but it couldn’t be delivered to any server right now.\n"
+                        "Please try again in a bit."
+                    )
+                )
             else:
                 await interaction.edit_original_response(
                     content=(
@@ -66,6 +66,9 @@ class LfgChannelAdmin(commands.Cog):
                     int(interaction.guild_id),
                     int(channel.id),
                 )
+            # Keep the shared { guild_id: lfg_channel_id } cache in step with the row
+            self.bot.lfg_channels = getattr(self.bot, "lfg_channels", {})
+            self.bot.lfg_channels[int(interaction.guild_id)] = int(channel.id)
             await interaction.response.send_message(
                 f"✅ LFG channel set to {channel.mention}.", ephemeral=True
             )
@@ -92,6 +95,7 @@ class LfgChannelAdmin(commands.Cog):
                     """,
                     int(interaction.guild_id),
                 )
+            getattr(self.bot, "lfg_channels", {}).pop(int(interaction.guild_id), None)
             await interaction.response.send_message(
                 "🧹 Cleared the LFG channel for this server.", ephemeral=True
             )
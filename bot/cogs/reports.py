@@ -231,7 +231,6 @@ class TimeoutModal(ui.Modal, title="Timeout Reported User"):
             return
 
         try:
-            await moderation_db.ensure_user_timeouts_schema()
             now = datetime.now(timezone.utc)
             until = now + (timedelta(minutes=mins) if mins > 0 else timedelta(days=36500))
             await moderation_db.add_timeout(
@@ -302,6 +301,11 @@ class AdReportModal(ui.Modal, title="Report this ad"):
             return
 
         try:
+            # The ad button reads the poster from the embed, so confirm the ad still exists here
+            if not await reports_db.ad_exists(self.ad_id):
+                await interaction.response.send_message("This ad no longer exists.", ephemeral=True)
+                return
+
             # Insert report
             report_id, total_reports = await reports_db.insert_report(
                 origin_guild_id=self.origin_guild_id,
@@ -351,8 +355,6 @@ class AdReportModal(ui.Modal, title="Report this ad"):
             if jump:
                 embed.add_field(name="Original Message", value=f"[Jump to message]({jump})", inline=False)
 
-            await moderation_db.ensure_user_timeouts_schema()
-
             await channel.send(
                 embed=embed,
                 view=ReportModerationView(
@@ -7,8 +7,10 @@ from ..db import get_pool
 
 log = logging.getLogger(__name__)
 TABLE_FQN = "public.user_post_cooldowns"
+_schema_ready = False  # set once ensure_cooldowns_schema() has run in this process
 
 async def ensure_cooldowns_schema() -> None:
+    global _schema_ready
     pool = get_pool()
     if not pool:
         raise RuntimeError("DB pool not initialized")
@@ -39,6 +41,7 @@ async def ensure_cooldowns_schema() -> None:
                 log.warning("Missing DDL privilege for: %s", stmt)
             except PostgresError:
                 pass  # ignore harmless races
+    _schema_ready = True
 
 async def get_next_ok_at(user_id: int) -> Optional[datetime]:
     pool = get_pool()
@@ -55,7 +58,8 @@ async def set_next_ok_at(user_id: int, when: datetime, *, reason: str | None = N
     pool = get_pool()
     if not pool:
         raise RuntimeError("DB pool not initialized")
-    await ensure_cooldowns_schema()
+    if not _schema_ready:
+        await ensure_cooldowns_schema()
     async with pool.acquire() as conn:
         UPSERT = f"""
             INSERT INTO {TABLE_FQN} (user_id, next_ok_at, reason, created_at, updated_at)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -11,6 +14,100 @@ log = logging.getLogger(__name__)
 
 TABLE_FQN = "public.user_timeouts"
 
+# ---------- Negative cache ----------
+# Short-lived memory of "not timed out" answers, keyed (guild_id, user_id); guild_id None = global.
+# A global miss covers every guild, since the global read is MAX(until) over all of the user's rows.
+NEGATIVE_CACHE_TTL = 30.0
+_NEGATIVE_CACHE_MAX = 10_000
+# Entries share one TTL, so insertion order is expiry order and eviction pops the front.
+_not_timed_out: OrderedDict[tuple[Optional[int], int], float] = OrderedDict()
+
+def _cached_not_timed_out(guild_id: Optional[int], user_id: int) -> bool:
+    now = time.monotonic()
+    for key in ((None, user_id), (guild_id, user_id)):
+        exp = _not_timed_out.get(key)
+        if exp is not None and exp > now:
+            return True
+    return False
+
+def _remember_not_timed_out(guild_id: Optional[int], user_id: int, gen: int) -> None:
+    """`gen` is _active_gen from before the read; if add_timeout ran since, the answer may predate it."""
+    if gen != _active_gen:
+        return
+    now = time.monotonic()
+    key = (guild_id, user_id)
+    _not_timed_out.pop(key, None)
+    _not_timed_out[key] = now + NEGATIVE_CACHE_TTL
+    while len(_not_timed_out) > _NEGATIVE_CACHE_MAX or next(iter(_not_timed_out.values())) <= now:
+        _not_timed_out.popitem(last=False)
+
+def forget_user(user_id: int) -> None:
+    """Drop cached answers for a user (called after their timeouts change)."""
+    for key in [k for k in _not_timed_out if k[1] == user_id]:
+        del _not_timed_out[key]
+
+# ---------- Active-timeout snapshot ----------
+# user_id -> latest active expiry, loaded from the table and updated by add_timeout.
+# A user absent from a fresh snapshot has no active timeout, so reads skip the DB.
+# It's only trusted for ACTIVE_SNAPSHOT_TTL seconds, then reloaded in the background
+# (rows edited outside this process are picked up on the next load).
+ACTIVE_SNAPSHOT_TTL = 60.0
+_active_until: dict[int, datetime] | None = None
+_active_loaded_at = 0.0
+_active_gen = 0  # bumped by add_timeout; reads that overlapped it (snapshot, negative cache) are redone or dropped
+_active_reload: asyncio.Task | None = None
+_ACTIVE_LOAD_ATTEMPTS = 3
+
+async def load_active_timeouts() -> None:
+    """(Re)load the snapshot of users with a timeout still in the future."""
+    global _active_until, _active_loaded_at
+    pool = get_pool()
+    if pool is None:
+        raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
+    for _ in range(_ACTIVE_LOAD_ATTEMPTS):
+        gen = _active_gen
+        async with pool.acquire() as conn:
+            try:
+                rows = await conn.fetch(
+                    f"""
+                    SELECT user_id, MAX(COALESCE(until, expires_at)) AS until
+                    FROM {TABLE_FQN}
+                    WHERE COALESCE(until, expires_at) > NOW()
+                    GROUP BY user_id
+                    """
+                )
+            except (UndefinedTableError, UndefinedColumnError):
+                rows = []
+        # A timeout written while we read may be missing from `rows`; read again
+        # rather than swap in a snapshot that would clear that user.
+        if gen == _active_gen:
+            break
+    else:
+        # Timeouts keep landing mid-read: keep the current snapshot and its age, so
+        # reads stay on the DB path until a later reload gets a clean pass.
+        log.info("Active timeouts changed during %d loads; keeping previous snapshot", _ACTIVE_LOAD_ATTEMPTS)
+        return
+    _active_until = {int(r["user_id"]): r["until"] for r in rows}
+    _active_loaded_at = time.monotonic()
+
+async def _reload_active_timeouts() -> None:
+    try:
+        await load_active_timeouts()
+    except Exception:
+        log.exception("Reloading active timeouts failed; using the DB until it succeeds")
+
+def _snapshot_clears(user_id: int, now: datetime) -> bool:
+    """True when a fresh snapshot proves the user has no active timeout."""
+    global _active_reload
+    if _active_until is None:
+        return False
+    if time.monotonic() - _active_loaded_at >= ACTIVE_SNAPSHOT_TTL:
+        if _active_reload is None or _active_reload.done():
+            _active_reload = asyncio.create_task(_reload_active_timeouts())
+        return False
+    until = _active_until.get(user_id)
+    return until is None or until <= now
+
 # ---------- Schema ----------
 
 async def ensure_user_timeouts_schema() -> None:
@@ -93,6 +190,7 @@ async def add_timeout(
     Upsert a timeout for (guild_id, user_id). We mirror `expires_at = until`
     for compatibility with older schemas that required expires_at NOT NULL.
     """
+    global _active_gen
     pool = get_pool()
     if pool is None:
         raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
@@ -133,6 +231,12 @@ async def add_timeout(
         except Exception:
             log.exception("add_timeout failed (guild=%s user=%s)", guild_id, user_id)
             raise
+    _active_gen += 1
+    forget_user(int(user_id))
+    if _active_until is not None:
+        prev = _active_until.get(int(user_id))
+        if prev is None or until > prev:
+            _active_until[int(user_id)] = until
 
 # ---------- Reads (per-guild) ----------
 
@@ -151,9 +255,15 @@ async def get_timeout_until(guild_id: int, user_id: int) -> Optional[datetime]:
     return row["until"] if row else None
 
 async def is_user_timed_out(guild_id: int, user_id: int, *, now: Optional[datetime] = None) -> bool:
+    if _cached_not_timed_out(int(guild_id), int(user_id)):
+        return False
     now = now or datetime.now(timezone.utc)
+    gen = _active_gen
     until = await get_timeout_until(int(guild_id), int(user_id))
-    return bool(until and until > now)
+    timed_out = bool(until and until > now)
+    if not timed_out:
+        _remember_not_timed_out(int(guild_id), int(user_id), gen)
+    return timed_out
 
 # ---------- Reads (GLOBAL) ----------
 
@@ -172,6 +282,50 @@ async def get_global_timeout_until(user_id: int, *, now: Optional[datetime] = No
     return row["until"] if row and row["until"] else None
 
 async def is_user_globally_timed_out(user_id: int, *, now: Optional[datetime] = None) -> bool:
+    if _cached_not_timed_out(None, int(user_id)):
+        return False
     now = now or datetime.now(timezone.utc)
+    gen = _active_gen
     until = await get_global_timeout_until(int(user_id), now=now)
-    return bool(until and until > now)
+    timed_out = bool(until and until > now)
+    if not timed_out:
+        _remember_not_timed_out(None, int(user_id), gen)
+    return timed_out
+
+# ---------- Reads (combined) ----------
+
+async def get_timeouts(
+    user_id: int, guild_id: Optional[int] = None, *, now: Optional[datetime] = None
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """
+    (global_until, guild_until) for a user in one round-trip. Either is None when
+    there is no row; an expired timestamp is returned as-is for the caller to compare.
+    """
+    if _cached_not_timed_out(guild_id, int(user_id)):
+        return None, None
+    now = now or datetime.now(timezone.utc)
+    if _snapshot_clears(int(user_id), now):
+        return None, None
+    gen = _active_gen
+    pool = get_pool()
+    if pool is None:
+        raise RuntimeError("DB pool is not initialized; check DATABASE_URL and pool init in main().")
+    async with pool.acquire() as conn:
+        try:
+            row = await conn.fetchrow(
+                f"""
+                SELECT MAX(COALESCE(until, expires_at)) AS global_until,
+                       MAX(COALESCE(until, expires_at)) FILTER (WHERE guild_id = $2) AS guild_until
+                FROM {TABLE_FQN}
+                WHERE user_id = $1
+                """,
+                int(user_id), guild_id,
+            )
+        except (UndefinedTableError, UndefinedColumnError):
+            return None, None
+    global_until = row["global_until"] if row else None
+    guild_until = row["guild_until"] if row else None
+    if not (global_until and global_until > now):
+        # global_until is the max over every row, so this clears the guild too.
+        _remember_not_timed_out(None, int(user_id), gen)
+    return global_until, guild_until
@@ -48,6 +48,11 @@ async def create_reports_table() -> None:
             ON report_conversations (reporter_id) WHERE is_open = TRUE;
         """)
 
+async def ad_exists(ad_id: int) -> bool:
+    pool = await _get_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetchval("SELECT 1 FROM lfg_ads WHERE id = $1", int(ad_id)) is not None
+
 async def insert_report(
     *,
     origin_guild_id: int,
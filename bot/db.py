@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Iterable
 import os
 import time
@@ -64,7 +65,15 @@ async def init_pool(dsn: str) -> None:
     Initialize the global connection pool and ensure baseline tables exist.
     """
     global _pool
-    _pool = await asyncpg.create_pool(dsn, min_size=1, max_size=4)
+    # Hot lookups are a handful of fixed SQL strings: keep them prepared for the
+    # connection's lifetime instead of re-preparing every 5 minutes (asyncpg default).
+    _pool = await asyncpg.create_pool(
+        dsn,
+        min_size=1,
+        max_size=4,
+        statement_cache_size=256,
+        max_cached_statement_lifetime=0,
+    )
     async with _pool.acquire() as conn:
         await conn.execute(CREATE_SQL)
         await conn.execute(CREATE_STATS_SQL)
@@ -125,16 +134,39 @@ async def stats_remove_guild(guild_id: int) -> None:
             int(guild_id),
         )
 
+_STATS_INC_SQL = """
+INSERT INTO bot_counters(metric, value) VALUES ($1, $2)
+ON CONFLICT (metric) DO UPDATE SET value = bot_counters.value + EXCLUDED.value
+"""
+
 async def stats_inc(metric: str, by: int = 1) -> None:
     pool = _require_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO bot_counters(metric, value) VALUES ($1, $2)
-            ON CONFLICT (metric) DO UPDATE SET value = bot_counters.value + EXCLUDED.value
-            """,
-            metric, int(by),
-        )
+        await conn.execute(_STATS_INC_SQL, metric, int(by))
+
+# -------- batched counters (hot paths bump in memory; a background task flushes) --------
+
+_stat_deltas: defaultdict[str, int] = defaultdict(int)
+
+def stats_bump(metric: str, by: int = 1) -> None:
+    """Queue a counter increment without a DB round-trip; applied by stats_flush()."""
+    _stat_deltas[metric] += int(by)
+
+async def stats_flush() -> None:
+    """Apply all queued increments. On failure they are put back for the next flush."""
+    if not _stat_deltas:
+        return
+    pending = dict(_stat_deltas)
+    _stat_deltas.clear()
+    try:
+        pool = _require_pool()
+        async with pool.acquire() as conn:
+            # executemany is atomic: either every metric lands or none does.
+            await conn.executemany(_STATS_INC_SQL, list(pending.items()))
+    except BaseException:
+        for metric, by in pending.items():
+            _stat_deltas[metric] += by
+        raise
 
 async def stats_set_counter(metric: str, value: int) -> None:
     pool = _require_pool()
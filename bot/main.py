@@ -103,4 +103,9 @@ async def main():
     )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # listed in requirements.txt (not on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
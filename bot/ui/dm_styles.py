@@ -1,11 +1,23 @@
 from __future__ import annotations
 
 import datetime
+import time
 from typing import Optional
 
 import discord
 
 
+_TS_CACHE: tuple[int, datetime.datetime | None] = (0, None)
+
+def embed_timestamp() -> datetime.datetime:
+    """Aware UTC "now" at second resolution, reused within the same second."""
+    global _TS_CACHE
+    sec = int(time.time())
+    if sec != _TS_CACHE[0] or _TS_CACHE[1] is None:
+        _TS_CACHE = (sec, datetime.datetime.fromtimestamp(sec, tz=datetime.timezone.utc))
+    return _TS_CACHE[1]
+
+
 async def send_pretty_interest_dm(
     recipient: discord.User | discord.Member,
     poster: discord.User | discord.Member,
@@ -17,7 +29,7 @@ async def send_pretty_interest_dm(
     message_jump: Optional[str],
     guild: Optional[discord.Guild],
 ) -> None:
-    color_seed = (sum(ord(c) for c in (game or "")) % 255)
+    color_seed = sum((game or "").encode()) % 255
     color = discord.Color.from_rgb(80, 120 + color_seed // 2, 255 - color_seed)
 
     lines = [
@@ -42,7 +54,7 @@ async def send_pretty_interest_dm(
         title="You’re connected! 🎮",
         description="\n".join(lines),
         color=color,
-        timestamp=datetime.datetime.utcnow(),
+        timestamp=embed_timestamp(),
     )
 
     avatar = getattr(getattr(poster, "display_avatar", None), "url", None)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+import asyncio
+import time
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per `per` seconds, bursting up to `rate`.
+    `await bucket.acquire()` (or `async with bucket:`) waits until a token is free;
+    waiters are served in arrival order.
+    """
+    def __init__(self, rate: float, per: float = 1.0) -> None:
+        self.capacity = float(rate)
+        self._fill_per_sec = rate / per
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self._fill_per_sec)
+        self._ts = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._fill_per_sec)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None